@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from models import EventResponse
+from services.event_serializer import event_to_dict, events_json
+
+EVENT_COUNT = int(os.environ.get("BENCH_EVENTS", "5000"))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "20"))
+
+events_adapter = TypeAdapter(List[EventResponse])
+
+
+def load_rows(count):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute('''
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY, title TEXT, description TEXT, date TEXT, location TEXT,
+            genre TEXT, total_tickets INTEGER, available_tickets INTEGER, price REAL
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (i, f"Film {i}", "Descriere film " * 8, f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}T19:00:00",
+             ("Iulius Mall", "VIVO Cluj", "Florin Piersic")[i % 3], "SF", 120, 120 - i % 120, 35.0)
+            for i in range(1, count + 1)
+        ],
+    )
+    rows = conn.execute("SELECT * FROM events ORDER BY date, id").fetchall()
+    conn.close()
+    return rows
+
+
+def standard_path(rows):
+    events_list = [event_to_dict(row) for row in rows]
+    unique_events = list({e["id"]: e for e in events_list}.values())
+    validated = events_adapter.validate_python(unique_events)
+    return JSONResponse(events_adapter.dump_python(validated, mode="json")).body
+
+
+def fast_path(rows):
+    return events_json(rows)
+
+
+def measure(fn, rows):
+    fn(rows)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        body = fn(rows)
+    return (time.perf_counter() - start) / ROUNDS * 1000, body
+
+
+if __name__ == "__main__":
+    rows = load_rows(EVENT_COUNT)
+    standard_ms, standard_body = measure(standard_path, rows)
+    fast_ms, fast_body = measure(fast_path, rows)
+
+    print(f"{EVENT_COUNT} events, {ROUNDS} rounds, {len(fast_body)} bytes per response")
+    print(f"identical output: {standard_body == fast_body}")
+    print(f"EventResponse path: {standard_ms:8.2f} ms")
+    print(f"fast JSON path:     {fast_ms:8.2f} ms  ({standard_ms / fast_ms:.1f}x)")
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.seat_map import PREFERRED_ROW, ROW_WEIGHT, SeatMap
+
+HALLS = [(20, 25), (60, 80), (200, 150)]
+OCCUPANCY = float(os.environ.get("BENCH_OCCUPANCY", "0.85"))
+QUANTITIES = (2, 4, 6)
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "50"))
+
+
+def fragmented(rows, seats_per_row, occupancy, seed=7):
+    rng = random.Random(seed)
+    seat_map = SeatMap(rows, seats_per_row)
+    for index in range(seat_map.capacity):
+        if rng.random() < occupancy:
+            seat_map.taken |= 1 << index
+    return seat_map
+
+
+def per_seat_best(seat_map, quantity):
+    center = (seat_map.seats_per_row - quantity) // 2
+    preferred_row = int((seat_map.rows - 1) * PREFERRED_ROW)
+    best = None
+    for row in range(seat_map.rows):
+        run = 0
+        for seat in range(seat_map.seats_per_row):
+            run = 0 if seat_map.is_taken(row + 1, seat + 1) else run + 1
+            if run >= quantity:
+                start = seat - quantity + 1
+                score = abs(row - preferred_row) * ROW_WEIGHT + abs(start - center)
+                if not best or score < best[0]:
+                    best = (score, row, start)
+    if not best:
+        return None
+    _, row, start = best
+    return [(row + 1, start + seat + 1) for seat in range(quantity)]
+
+
+def score(seat_map, seats):
+    if not seats:
+        return None
+    row, start = seats[0]
+    center = (seat_map.seats_per_row - len(seats)) // 2
+    preferred_row = int((seat_map.rows - 1) * PREFERRED_ROW)
+    return abs(row - 1 - preferred_row) * ROW_WEIGHT + abs(start - 1 - center)
+
+
+def measure(fn, seat_map, quantity, rounds):
+    fn(seat_map, quantity)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        seats = fn(seat_map, quantity)
+    return (time.perf_counter() - start) / rounds * 1000, seats
+
+
+if __name__ == "__main__":
+    print(f"occupancy {OCCUPANCY:.0%}, {ROUNDS} rounds")
+    for rows, seats_per_row in HALLS:
+        seat_map = fragmented(rows, seats_per_row, OCCUPANCY)
+        for quantity in QUANTITIES:
+            per_seat_ms, expected = measure(per_seat_best, seat_map, quantity, max(1, ROUNDS // 10))
+            bitmap_ms, seats = measure(SeatMap.best_available, seat_map, quantity, ROUNDS)
+            same = score(seat_map, seats) == score(seat_map, expected)
+            print(f"{rows}x{seats_per_row} hall, {quantity} seats: per-seat {per_seat_ms:8.3f} ms, "
+                  f"bitmap {bitmap_ms:7.3f} ms ({per_seat_ms / bitmap_ms:5.1f}x), same score: {same}")
@@ -1,14 +1,57 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
-import sqlite3
+from typing import Dict, Optional, List
+import asyncio
+import json
+import time
+import os
 import uvicorn
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from factories.ticket_factory import TicketPricingFactory
+from storage.connection_pool import ConnectionPool
+from storage.profiles import get_profile, effective_settings
+from storage.indexes import ensure_indexes, verify_indexes
+from storage.migrations import ensure_column, ensure_date_ts, ensure_title_key
+from storage.fts import SEARCH_SQL, ensure_fts, build_match_query
+from services.purchase_writer import PurchaseWriter
+from observers.catalog_observer import CatalogSubject
+from observers.location_index import LocationIndex
+from observers.catalog_version import CatalogVersion, etag_matches
+from observers.response_cache import ResponseCache
+from observers.availability_broadcaster import AvailabilityBroadcaster
+from observers.change_log import ChangeLog
+from observers.availability_table import AvailabilityTable
+from services.event_serializer import event_to_dict, events_json, event_json_bytes
+from services.export import iter_ndjson
+from services.event_dates import to_timestamp
+from services.collation import title_sort_key
+from services.idempotency import IdempotencyMismatch, IdempotencyStore, request_fingerprint
+from services.hold_sweeper import HoldSweeper
+from services.seat_map import InvalidSeat, SeatMap, SeatUnavailable, format_seats, parse_seats
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, encode_cursor, decode_cursor
+from strategies.filter_strategies import (
+    CompositeFilterStrategy,
+    DateRangeFilterStrategy,
+    GenreFilterStrategy,
+    LocationFilterStrategy,
+    SearchFilterStrategy,
+)
+from strategies.sort_strategies import create_sort_strategy
+
+@asynccontextmanager
+async def lifespan(app):
+    purchase_writer.start()
+    hold_sweeper.start()
+    yield
+    hold_sweeper.stop()
+    purchase_writer.stop()
+    db_pool.close()
 
-app = FastAPI(title="Ticket Sales API")
+app = FastAPI(title="Ticket Sales API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +59,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Idempotent-Replayed"],
+)
+
+STORAGE_PROFILE = os.environ.get("DB_STORAGE_PROFILE", "fast")
+FAST_JSON = os.environ.get("EVENTS_FAST_JSON", "0") == "1"
+DB_PATH = os.environ.get("DB_PATH", "tickets.db")
+
+db_pool = ConnectionPool(
+    DB_PATH,
+    size=int(os.environ.get("DB_POOL_SIZE", "5")),
+    timeout=float(os.environ.get("DB_POOL_TIMEOUT", "5")),
+    pragmas=get_profile(STORAGE_PROFILE),
+)
+
+idempotency_store = IdempotencyStore(ttl_seconds=int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400")))
+
+HOLD_TTL_SECONDS = int(os.environ.get("HOLD_TTL_SECONDS", "600"))
+WAITLIST_PROMOTION_BATCH = 100
+
+purchase_writer = PurchaseWriter(
+    db_pool,
+    window=float(os.environ.get("PURCHASE_BATCH_WINDOW_MS", "2")) / 1000,
+    max_batch=int(os.environ.get("PURCHASE_BATCH_SIZE", "256")),
 )
 
 class EventCreate(BaseModel):
@@ -43,6 +109,50 @@ class TicketPurchase(BaseModel):
     customer_email: str
     quantity: int
 
+class EventChange(BaseModel):
+    type: str
+    event_id: int
+    version: int
+    available_tickets: Optional[int] = None
+    event: Optional[EventResponse] = None
+
+class EventChangesResponse(BaseModel):
+    epoch: str
+    version: int
+    reset: bool
+    changes: List[EventChange]
+
+class AvailabilityResponse(BaseModel):
+    version: int
+    availability: Dict[int, int]
+
+class LocationResponse(BaseModel):
+    location: str
+    upcoming_events: int
+
+class Seat(BaseModel):
+    row: int
+    seat: int
+
+class HoldResponse(BaseModel):
+    id: int
+    event_id: int
+    customer_name: str
+    customer_email: str
+    quantity: int
+    expires_at: int
+    seats: Optional[List[Seat]] = None
+
+class TicketLine(BaseModel):
+    event_id: int
+    quantity: int
+    ticket_type: str = "adult"
+
+class BatchPurchase(BaseModel):
+    customer_name: str
+    customer_email: str
+    lines: List[TicketLine]
+
 class TicketResponse(BaseModel):
     id: int
     event_id: int
@@ -51,6 +161,62 @@ class TicketResponse(BaseModel):
     quantity: int
     total_price: float
     is_paid: bool
+    seats: Optional[List[Seat]] = None
+
+class WaitlistResponse(BaseModel):
+    id: int
+    event_id: int
+    customer_name: str
+    customer_email: str
+    quantity: int
+    ticket_id: Optional[int] = None
+    position: Optional[int] = None
+
+class SeatMapCreate(BaseModel):
+    rows: int
+    seats_per_row: int
+
+class SeatMapResponse(BaseModel):
+    event_id: int
+    rows: int
+    seats_per_row: int
+    available: int
+    seats: List[str]
+
+class SeatPurchase(BaseModel):
+    event_id: int
+    customer_name: str
+    customer_email: str
+    seats: List[Seat]
+
+class BatchPurchaseResponse(BaseModel):
+    tickets: List[TicketResponse]
+    total_price: float
+
+
+class EventNotFound(Exception):
+    pass
+
+class NotEnoughTickets(Exception):
+    pass
+
+class InvalidQuantity(Exception):
+    pass
+
+class TicketNotFound(Exception):
+    pass
+
+class HoldNotFound(Exception):
+    pass
+
+class SeatMapNotFound(Exception):
+    pass
+
+class WaitlistEntryNotFound(Exception):
+    pass
+
+class TicketsAvailable(Exception):
+    pass
 
 
 class Command(ABC):
@@ -69,12 +235,10 @@ class RemoveMovieCommand(Command):
         self.saved_event = None
 
     def execute(self):
-        conn = sqlite3.connect('tickets.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM events WHERE id = ?", (self.event_id,))
-        self.saved_event = cursor.fetchone()
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM events WHERE id = ?", (self.event_id,))
+            self.saved_event = cursor.fetchone()
         if not self.saved_event:
             raise Exception("Event not found")
         self.cinema.remove_movie(self.event_id)
@@ -100,12 +264,10 @@ class CancelTicketCommand(Command):
         self.saved_ticket = None
 
     def execute(self):
-        conn = sqlite3.connect('tickets.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tickets WHERE id = ?", (self.ticket_id,))
-        self.saved_ticket = cursor.fetchone()
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM tickets WHERE id = ?", (self.ticket_id,))
+            self.saved_ticket = cursor.fetchone()
         if not self.saved_ticket:
             raise Exception("Ticket not found")
         self.cinema.cancel_ticket(self.ticket_id)
@@ -113,72 +275,422 @@ class CancelTicketCommand(Command):
     def undo(self):
         if self.saved_ticket:
             ticket = self.saved_ticket
-            self.cinema.reserve_ticket(
+            if ticket["seats"]:
+                self.ticket_id = self.cinema.purchase_seats(
+                    ticket["event_id"],
+                    ticket["customer_name"],
+                    ticket["customer_email"],
+                    parse_seats(ticket["seats"])
+                )["id"]
+                return
+            self.ticket_id = self.cinema.reserve_ticket(
                 ticket["event_id"],
                 ticket["customer_name"],
                 ticket["customer_email"],
                 ticket["quantity"]
             )
 
-class Cinema:
+class Cinema(CatalogSubject):
     def add_movie(self, event):
-        conn = sqlite3.connect('tickets.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO events (title, description, date, location, total_tickets, available_tickets, price)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (event.title, event.description, event.date, event.location,
-              event.total_tickets, event.total_tickets, event.price))
-        conn.commit()
-        event_id = cursor.lastrowid
-        conn.close()
-        return event_id
+        return self.add_movies([event])[0]
+
+    def add_movies(self, events):
+        rows = purchase_writer.submit(self.insert_movies, events, on_commit=self.movies_added).result()
+        return [row["id"] for row in rows]
+
+    def insert_movies(self, cursor, events):
+        rows = []
+        for event in events:
+            cursor.execute('''
+                INSERT INTO events (title, title_key, description, date, date_ts, location, total_tickets,
+                                    available_tickets, price)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING *
+            ''', (event.title, title_sort_key(event.title), event.description, event.date,
+                  to_timestamp(event.date), event.location, event.total_tickets, event.total_tickets, event.price))
+            rows.append(cursor.fetchone())
+        return rows
+
+    def movies_added(self, rows):
+        for row in rows:
+            self.notify("event_added", row)
 
     def remove_movie(self, event_id):
-        conn = sqlite3.connect('tickets.db')
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-        conn.commit()
-        conn.close()
+        purchase_writer.submit(self.delete_movie, event_id, on_commit=self.movie_removed).result()
+
+    def delete_movie(self, cursor, event_id):
+        cursor.execute("DELETE FROM events WHERE id = ? RETURNING id", (event_id,))
+        removed = cursor.fetchone()
+        cursor.execute("DELETE FROM seat_maps WHERE event_id = ?", (event_id,))
+        cursor.execute("DELETE FROM waitlist WHERE event_id = ? AND ticket_id IS NULL", (event_id,))
+        return event_id if removed else None
+
+    def movie_removed(self, event_id):
+        if event_id is not None:
+            self.notify("event_removed", event_id)
 
     def reserve_ticket(self, event_id, customer_name, customer_email, quantity):
-        conn = sqlite3.connect('tickets.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+        return self.purchase(event_id, customer_name, customer_email, quantity)["id"]
+
+    def purchase(self, event_id, customer_name, customer_email, quantity):
+        ticket, _ = purchase_writer.submit(
+            self.claim_tickets, event_id, customer_name, customer_email, quantity,
+            on_commit=self.inventory_committed,
+        ).result()
+        return ticket
+
+    def purchase_once(self, key, fingerprint, now, event_id, customer_name, customer_email, quantity):
+        ticket, _, created_at, replayed = purchase_writer.submit(
+            self.claim_tickets_once, key, fingerprint, now, event_id, customer_name, customer_email, quantity,
+            on_commit=self.purchase_once_committed,
+        ).result()
+        return ticket, created_at, replayed
+
+    def purchase_once_committed(self, result):
+        self.inventory_committed(result[:2])
+
+    def claim_tickets_once(self, cursor, key, fingerprint, now, event_id, customer_name, customer_email, quantity):
+        cursor.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (now - idempotency_store.ttl_seconds,))
+        cursor.execute("SELECT fingerprint, response, created_at FROM idempotency_keys WHERE key = ?", (key,))
+        stored = cursor.fetchone()
+        if stored:
+            if stored["fingerprint"] != fingerprint:
+                raise IdempotencyMismatch("Idempotency-Key was already used for a different purchase")
+            return json.loads(stored["response"]), None, stored["created_at"], True
+        ticket, available_tickets = self.claim_tickets(cursor, event_id, customer_name, customer_email, quantity)
+        response = dict(ticket)
+        cursor.execute(
+            "INSERT INTO idempotency_keys (key, fingerprint, response, created_at) VALUES (?, ?, ?, ?)",
+            (key, fingerprint, json.dumps(response), now),
+        )
+        return response, available_tickets, now, False
+
+    def inventory_committed(self, result):
+        ticket, available_tickets = result
+        if available_tickets is not None:
+            self.notify("availability_changed", ticket["event_id"], available_tickets)
+
+    def purchase_basket(self, customer_name, customer_email, lines):
+        results = purchase_writer.submit(
+            self.claim_basket, customer_name, customer_email, lines,
+            on_commit=self.basket_committed,
+        ).result()
+        return [ticket for ticket, _ in results]
+
+    def basket_committed(self, results):
+        for result in results:
+            self.inventory_committed(result)
+
+    def claim_basket(self, cursor, customer_name, customer_email, lines):
+        results = []
+        for index, (event_id, quantity, pricing) in enumerate(lines, start=1):
+            try:
+                results.append(self.claim_tickets(cursor, event_id, customer_name, customer_email, quantity, pricing))
+            except (EventNotFound, NotEnoughTickets, InvalidQuantity) as e:
+                raise type(e)(f"Line {index}: {e}")
+        return results
+
+    def take_inventory(self, cursor, event_id, quantity):
+        if quantity <= 0:
+            raise InvalidQuantity("Quantity must be positive")
+        cursor.execute('''
+            UPDATE events
+            SET available_tickets = available_tickets - ?
+            WHERE id = ? AND available_tickets >= ?
+            RETURNING price, available_tickets
+        ''', (quantity, event_id, quantity))
         event = cursor.fetchone()
         if not event:
-            conn.close()
-            raise Exception("Event not found")
-        if event["available_tickets"] < quantity:
-            conn.close()
-            raise Exception("Not enough tickets")
-        total_price = event["price"] * quantity
+            cursor.execute("SELECT 1 FROM events WHERE id = ?", (event_id,))
+            if not cursor.fetchone():
+                raise EventNotFound("Event not found")
+            raise NotEnoughTickets("Not enough tickets")
+        return event
+
+    def claim_tickets(self, cursor, event_id, customer_name, customer_email, quantity, pricing=None, seats=None):
+        event = self.take_inventory(cursor, event_id, quantity)
+        seats = self.assign_seats(cursor, event_id, quantity, seats)
+        if pricing:
+            total_price = pricing.compute_total(event["price"], quantity)
+        else:
+            total_price = event["price"] * quantity
         cursor.execute('''
-            INSERT INTO tickets (event_id, customer_name, customer_email, quantity, total_price, is_paid)
+            INSERT INTO tickets (event_id, customer_name, customer_email, quantity, total_price, is_paid, seats)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING *
+        ''', (event_id, customer_name, customer_email, quantity, total_price, True,
+              format_seats(seats) if seats else None))
+        return cursor.fetchone(), event["available_tickets"]
+
+    def assign_seats(self, cursor, event_id, quantity, seats=None):
+        seat_map = self.load_seat_map(cursor, event_id)
+        if not seat_map:
+            if seats is not None:
+                raise SeatMapNotFound("This event has no seat map")
+            return None
+        if seats is None:
+            seats = seat_map.best_available(quantity)
+            if not seats:
+                raise NotEnoughTickets(f"No {quantity} adjacent seats available")
+        seat_map.claim(seat_map.mask(seats))
+        self.save_seat_map(cursor, event_id, seat_map)
+        return seats
+
+    def create_seat_map(self, event_id, rows, seats_per_row):
+        return purchase_writer.submit(self.install_seat_map, event_id, rows, seats_per_row).result()
+
+    def install_seat_map(self, cursor, event_id, rows, seats_per_row):
+        seat_map = SeatMap(rows, seats_per_row)
+        cursor.execute("SELECT total_tickets, available_tickets FROM events WHERE id = ?", (event_id,))
+        event = cursor.fetchone()
+        if not event:
+            raise EventNotFound("Event not found")
+        if seat_map.capacity != event["total_tickets"]:
+            raise InvalidSeat(f"The seat map must have exactly {event['total_tickets']} seats")
+        if event["available_tickets"] != event["total_tickets"]:
+            raise InvalidSeat("Tickets were already sold without assigned seats")
+        cursor.execute('''
+            INSERT INTO seat_maps (event_id, rows, seats_per_row, taken)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (event_id) DO UPDATE
+            SET rows = excluded.rows, seats_per_row = excluded.seats_per_row, taken = excluded.taken
+        ''', (event_id, rows, seats_per_row, seat_map.to_blob()))
+        return seat_map
+
+    def seat_map(self, event_id):
+        with get_db_connection() as conn:
+            seat_map = self.load_seat_map(conn.cursor(), event_id)
+        if not seat_map:
+            raise SeatMapNotFound("This event has no seat map")
+        return seat_map
+
+    def load_seat_map(self, cursor, event_id):
+        cursor.execute("SELECT rows, seats_per_row, taken FROM seat_maps WHERE event_id = ?", (event_id,))
+        row = cursor.fetchone()
+        return SeatMap.from_blob(row["rows"], row["seats_per_row"], row["taken"]) if row else None
+
+    def save_seat_map(self, cursor, event_id, seat_map):
+        cursor.execute("UPDATE seat_maps SET taken = ? WHERE event_id = ?", (seat_map.to_blob(), event_id))
+
+    def purchase_seats(self, event_id, customer_name, customer_email, seats):
+        ticket, _ = purchase_writer.submit(
+            self.claim_seats, event_id, customer_name, customer_email, seats,
+            on_commit=self.inventory_committed,
+        ).result()
+        return ticket
+
+    def claim_seats(self, cursor, event_id, customer_name, customer_email, seats):
+        return self.claim_tickets(cursor, event_id, customer_name, customer_email, len(seats), seats=seats)
+
+    def hold(self, event_id, customer_name, customer_email, quantity, ttl_seconds):
+        expires_at = int(time.time()) + ttl_seconds
+        hold, _ = purchase_writer.submit(
+            self.claim_hold, event_id, customer_name, customer_email, quantity, expires_at,
+            on_commit=self.inventory_committed,
+        ).result()
+        hold_sweeper.schedule(hold["id"], hold["expires_at"])
+        return hold
+
+    def claim_hold(self, cursor, event_id, customer_name, customer_email, quantity, expires_at):
+        event = self.take_inventory(cursor, event_id, quantity)
+        seats = self.assign_seats(cursor, event_id, quantity)
+        cursor.execute('''
+            INSERT INTO holds (event_id, customer_name, customer_email, quantity, expires_at, seats)
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (event_id, customer_name, customer_email, quantity, total_price, True))
-        ticket_id = cursor.lastrowid
-        cursor.execute('UPDATE events SET available_tickets = available_tickets - ? WHERE id = ?',
-                       (quantity, event_id))
-        conn.commit()
-        conn.close()
-        return ticket_id
+            RETURNING *
+        ''', (event_id, customer_name, customer_email, quantity, expires_at, format_seats(seats) if seats else None))
+        return cursor.fetchone(), event["available_tickets"]
+
+    def confirm_hold(self, hold_id):
+        ticket, _ = purchase_writer.submit(self.convert_hold, hold_id, int(time.time())).result()
+        return ticket
+
+    def convert_hold(self, cursor, hold_id, now):
+        cursor.execute("DELETE FROM holds WHERE id = ? AND expires_at > ? RETURNING *", (hold_id, now))
+        hold = cursor.fetchone()
+        if not hold:
+            raise HoldNotFound("Hold not found or expired")
+        cursor.execute("SELECT price FROM events WHERE id = ?", (hold["event_id"],))
+        event = cursor.fetchone()
+        if not event:
+            raise EventNotFound("Event not found")
+        cursor.execute('''
+            INSERT INTO tickets (event_id, customer_name, customer_email, quantity, total_price, is_paid, seats)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING *
+        ''', (hold["event_id"], hold["customer_name"], hold["customer_email"], hold["quantity"],
+              event["price"] * hold["quantity"], True, hold["seats"]))
+        return cursor.fetchone(), None
+
+    def release_hold(self, hold_id):
+        released = purchase_writer.submit(
+            self.release_holds, [hold_id], on_commit=self.holds_released,
+        ).result()
+        if not released:
+            raise HoldNotFound("Hold not found or expired")
+
+    def release_expired_holds(self, hold_ids):
+        purchase_writer.submit(
+            self.release_holds, hold_ids, int(time.time()), on_commit=self.holds_released,
+        ).result()
+
+    def release_holds(self, cursor, hold_ids, expired_before=None):
+        returned = {}
+        seats = {}
+        for start in range(0, len(hold_ids), 500):
+            chunk = hold_ids[start:start + 500]
+            sql = f"DELETE FROM holds WHERE id IN ({', '.join('?' * len(chunk))})"
+            params = list(chunk)
+            if expired_before is not None:
+                sql += " AND expires_at <= ?"
+                params.append(expired_before)
+            cursor.execute(sql + " RETURNING event_id, quantity, seats", params)
+            for hold in cursor.fetchall():
+                returned[hold["event_id"]] = returned.get(hold["event_id"], 0) + hold["quantity"]
+                seats.setdefault(hold["event_id"], []).extend(parse_seats(hold["seats"]))
+
+        for event_id, released in seats.items():
+            seat_map = self.load_seat_map(cursor, event_id)
+            if seat_map and released:
+                seat_map.release(seat_map.mask(released))
+                self.save_seat_map(cursor, event_id, seat_map)
+
+        results = []
+        for event_id, quantity in returned.items():
+            cursor.execute('''
+                UPDATE events
+                SET available_tickets = available_tickets + ?
+                WHERE id = ?
+                RETURNING available_tickets
+            ''', (quantity, event_id))
+            event = cursor.fetchone()
+            if not event:
+                continue
+            promotions, available_tickets = self.promote_waitlist(cursor, event_id, event["available_tickets"])
+            results.append((event_id, available_tickets, promotions))
+        return results
+
+    def holds_released(self, results):
+        for event_id, available_tickets, promotions in results:
+            self.inventory_returned(event_id, available_tickets, promotions)
+
+    def inventory_returned(self, event_id, available_tickets, promotions):
+        if available_tickets is not None:
+            self.notify("availability_changed", event_id, available_tickets)
+        if promotions:
+            self.notify("waitlist_promoted", event_id, promotions)
+
+    def join_waitlist(self, event_id, customer_name, customer_email, quantity):
+        return purchase_writer.submit(
+            self.enqueue_waitlist, event_id, customer_name, customer_email, quantity,
+        ).result()
+
+    def enqueue_waitlist(self, cursor, event_id, customer_name, customer_email, quantity):
+        if quantity <= 0:
+            raise InvalidQuantity("Quantity must be positive")
+        cursor.execute("SELECT total_tickets, available_tickets FROM events WHERE id = ?", (event_id,))
+        event = cursor.fetchone()
+        if not event:
+            raise EventNotFound("Event not found")
+        if quantity > event["total_tickets"]:
+            raise InvalidQuantity(f"This event only has {event['total_tickets']} tickets")
+        seat_map = self.load_seat_map(cursor, event_id)
+        if seat_map and quantity > seat_map.seats_per_row:
+            raise InvalidQuantity(f"At most {seat_map.seats_per_row} adjacent seats can be requested")
+        if event["available_tickets"] >= quantity and (not seat_map or seat_map.best_available(quantity)):
+            cursor.execute("SELECT 1 FROM waitlist WHERE event_id = ? AND ticket_id IS NULL LIMIT 1", (event_id,))
+            if not cursor.fetchone():
+                raise TicketsAvailable("Tickets are still available, buy them instead")
+        cursor.execute('''
+            INSERT INTO waitlist (event_id, customer_name, customer_email, quantity)
+            VALUES (?, ?, ?, ?)
+            RETURNING *
+        ''', (event_id, customer_name, customer_email, quantity))
+        return cursor.fetchone()
+
+    def promote_waitlist(self, cursor, event_id, available_tickets):
+        promotions = []
+        last_id = 0
+        while available_tickets > 0:
+            cursor.execute('''
+                SELECT * FROM waitlist
+                WHERE event_id = ? AND ticket_id IS NULL AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (event_id, last_id, WAITLIST_PROMOTION_BATCH))
+            entries = cursor.fetchall()
+            for entry in entries:
+                if entry["quantity"] > available_tickets:
+                    return promotions, available_tickets
+                cursor.execute("SAVEPOINT waitlist_promotion")
+                try:
+                    ticket, available_tickets = self.claim_tickets(
+                        cursor, event_id, entry["customer_name"], entry["customer_email"], entry["quantity"]
+                    )
+                except NotEnoughTickets:
+                    cursor.execute("ROLLBACK TO waitlist_promotion")
+                    cursor.execute("RELEASE waitlist_promotion")
+                    return promotions, available_tickets
+                cursor.execute("RELEASE waitlist_promotion")
+                cursor.execute("UPDATE waitlist SET ticket_id = ? WHERE id = ?", (ticket["id"], entry["id"]))
+                promotions.append({"waitlist_id": entry["id"], "ticket_id": ticket["id"]})
+            if len(entries) < WAITLIST_PROMOTION_BATCH:
+                break
+            last_id = entries[-1]["id"]
+        return promotions, available_tickets
+
+    def waitlist_entry(self, entry_id):
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM waitlist WHERE id = ?", (entry_id,))
+            entry = cursor.fetchone()
+            if not entry:
+                raise WaitlistEntryNotFound("Waitlist entry not found")
+            position = None
+            if entry["ticket_id"] is None:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM waitlist WHERE event_id = ? AND ticket_id IS NULL AND id <= ?",
+                    (entry["event_id"], entry_id),
+                )
+                position = cursor.fetchone()[0]
+        return entry, position
+
+    def leave_waitlist(self, entry_id):
+        purchase_writer.submit(self.remove_waitlist_entry, entry_id).result()
+
+    def remove_waitlist_entry(self, cursor, entry_id):
+        cursor.execute("DELETE FROM waitlist WHERE id = ? AND ticket_id IS NULL RETURNING id", (entry_id,))
+        if not cursor.fetchone():
+            raise WaitlistEntryNotFound("Waitlist entry not found or already promoted")
 
     def cancel_ticket(self, ticket_id):
-        conn = sqlite3.connect('tickets.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tickets WHERE id = ?", (ticket_id,))
+        purchase_writer.submit(self.release_tickets, ticket_id, on_commit=self.tickets_released).result()
+
+    def tickets_released(self, result):
+        ticket, available_tickets, promotions = result
+        self.inventory_returned(ticket["event_id"], available_tickets, promotions)
+
+    def release_tickets(self, cursor, ticket_id):
+        cursor.execute("DELETE FROM tickets WHERE id = ? RETURNING *", (ticket_id,))
         ticket = cursor.fetchone()
         if not ticket:
-            conn.close()
-            raise Exception("Ticket not found")
-        cursor.execute("UPDATE events SET available_tickets = available_tickets + ? WHERE id = ?",
-                       (ticket["quantity"], ticket["event_id"]))
-        cursor.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,))
-        conn.commit()
-        conn.close()
+            raise TicketNotFound("Ticket not found")
+        if ticket["seats"]:
+            seat_map = self.load_seat_map(cursor, ticket["event_id"])
+            if seat_map:
+                seat_map.release(seat_map.mask(parse_seats(ticket["seats"])))
+                self.save_seat_map(cursor, ticket["event_id"], seat_map)
+        cursor.execute('''
+            UPDATE events
+            SET available_tickets = available_tickets + ?
+            WHERE id = ?
+            RETURNING available_tickets
+        ''', (ticket["quantity"], ticket["event_id"]))
+        event = cursor.fetchone()
+        if not event:
+            return ticket, None, []
+        promotions, available_tickets = self.promote_waitlist(cursor, ticket["event_id"], event["available_tickets"])
+        return ticket, available_tickets, promotions
 
 
 class CommandManager:
@@ -205,86 +717,359 @@ class CommandManager:
 
 cinema = Cinema()
 manager = CommandManager()
+hold_sweeper = HoldSweeper(cinema.release_expired_holds)
+
+location_index = LocationIndex()
+cinema.attach(location_index)
+# The cache must drop stale bodies before the version moves on, otherwise a
+# request in between would pair the new ETag with an old cached body.
+response_cache = ResponseCache(max_entries=int(os.environ.get("EVENT_CACHE_SIZE", "256")))
+cinema.attach(response_cache)
+catalog_version = CatalogVersion()
+cinema.attach(catalog_version)
+availability_broadcaster = AvailabilityBroadcaster(catalog_version)
+cinema.attach(availability_broadcaster)
+change_log = ChangeLog(catalog_version, max_entries=int(os.environ.get("CHANGE_LOG_SIZE", "10000")))
+cinema.attach(change_log)
+availability_table = AvailabilityTable()
+cinema.attach(availability_table)
 
 
 def init_db():
     try:
-        conn = sqlite3.connect('tickets.db')
-        cursor = conn.cursor()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS events
-            (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                date TEXT NOT NULL,
-                location TEXT NOT NULL,
-                total_tickets INTEGER NOT NULL,
-                available_tickets INTEGER NOT NULL,
-                price REAL NOT NULL,
-                genre TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS events
+                (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    date TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    total_tickets INTEGER NOT NULL,
+                    available_tickets INTEGER NOT NULL,
+                    price REAL NOT NULL,
+                    genre TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    date_ts INTEGER,
+                    title_key TEXT
+                )
+            ''')
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tickets
-            (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_id INTEGER NOT NULL,
-                customer_name TEXT NOT NULL,
-                customer_email TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                total_price REAL NOT NULL,
-                is_paid BOOLEAN DEFAULT FALSE,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tickets
+                (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id INTEGER NOT NULL,
+                    customer_name TEXT NOT NULL,
+                    customer_email TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    total_price REAL NOT NULL,
+                    is_paid BOOLEAN DEFAULT FALSE,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    seats TEXT
+                )
+            ''')
+            ensure_column(cursor, "tickets", "seats", "TEXT")
 
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS waitlist
+                (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id INTEGER NOT NULL,
+                    customer_name TEXT NOT NULL,
+                    customer_email TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    ticket_id INTEGER,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS seat_maps
+                (
+                    event_id INTEGER PRIMARY KEY,
+                    rows INTEGER NOT NULL,
+                    seats_per_row INTEGER NOT NULL,
+                    taken BLOB NOT NULL
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS holds
+                (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id INTEGER NOT NULL,
+                    customer_name TEXT NOT NULL,
+                    customer_email TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    expires_at INTEGER NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    seats TEXT
+                )
+            ''')
+            ensure_column(cursor, "holds", "seats", "TEXT")
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS idempotency_keys
+                (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            ''')
+
+            for column, migrate in (("date_ts", ensure_date_ts), ("title_key", ensure_title_key)):
+                backfilled = migrate(cursor)
+                if backfilled:
+                    print(f"Backfilled {column} for {backfilled} events.")
+            created_indexes = ensure_indexes(cursor)
+            if ensure_fts(cursor):
+                print("Built full-text index for events.")
+            conn.commit()
+            settings = effective_settings(conn)
+            index_problems = verify_indexes(cursor)
         print("Database initialized.")
+        print(f"Storage profile '{STORAGE_PROFILE}': " +
+              ", ".join(f"{name}={value}" for name, value in settings.items()))
+        if created_indexes:
+            print(f"Created indexes: {', '.join(created_indexes)}")
+        for problem in index_problems:
+            print(f"Index check failed: {problem}")
     except Exception as e:
         print(f"Database error: {e}")
 
+def get_db_connection():
+    return db_pool.connection()
+
+def load_catalog_indexes():
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, location, date_ts, available_tickets FROM events")
+        events = cursor.fetchall()
+    location_index.load(events)
+    availability_table.load(events)
+
+def load_idempotency_keys():
+    now = int(time.time())
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (now - idempotency_store.ttl_seconds,))
+        conn.commit()
+        cursor.execute("SELECT * FROM idempotency_keys")
+        idempotency_store.load(cursor.fetchall(), now)
+
+def load_holds():
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, expires_at FROM holds")
+        holds = cursor.fetchall()
+    for hold in holds:
+        hold_sweeper.schedule(hold["id"], hold["expires_at"])
+
 init_db()
+load_catalog_indexes()
+load_idempotency_keys()
+load_holds()
 
-def get_db_connection():
-    conn = sqlite3.connect('tickets.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+CATALOG_CACHE_CONTROL = "no-cache"
+
+def not_modified(etag):
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL})
 
 @app.get("/")
 def read_root():
     return {"message": "Ticket Sales API is running!"}
 
 @app.get("/events/", response_model=List[EventResponse])
-def get_events():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM events ORDER BY date")
-    events = cursor.fetchall()
-    conn.close()
-
-    events_list = [
-        {
-            "id": event["id"],
-            "title": event["title"],
-            "description": event["description"],
-            "date": event["date"],
-            "location": event["location"],
-            "genre": event["genre"],
-            "total_tickets": event["total_tickets"],
-            "available_tickets": event["available_tickets"],
-            "price": event["price"],
-        }
-        for event in events
-    ]
+def get_events(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    location: Optional[str] = None,
+    genre: Optional[str] = None,
+    q: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    sort: str = "date",
+    if_none_match: Optional[str] = Header(None),
+):
+    try:
+        sort_strategy = create_sort_strategy(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = catalog_version.etag()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cache_key = ("events", limit, cursor, location, genre, q, date_from, date_to, sort_strategy.name)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation
+        filter_strategy = CompositeFilterStrategy([
+            LocationFilterStrategy(location),
+            GenreFilterStrategy(genre),
+            SearchFilterStrategy(q),
+            DateRangeFilterStrategy(date_from, date_to),
+        ])
+        events_list, next_cursor = query_events(filter_strategy, sort_strategy, limit, cursor)
+        body = events_json(events_list) if FAST_JSON else None
+        cached = (events_list, next_cursor, body)
+        response_cache.put(cache_key, cached, generation, [e["id"] for e in events_list])
+    events_list, next_cursor, body = cached
+
+    headers = {"Cache-Control": CATALOG_CACHE_CONTROL, "ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    return events_list
+
+def query_events(filter_strategy, sort_strategy, limit=None, cursor=None):
+    conditions = []
+    params = []
+    condition = filter_strategy.where()
+    if condition:
+        conditions.append(condition[0])
+        params += condition[1]
+
+    if cursor is not None:
+        try:
+            cursor_sort, value, event_id = decode_cursor(cursor, str, (str, int, float), int)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if cursor_sort != sort_strategy.name:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort")
+        condition = sort_strategy.after(value, event_id)
+        conditions.append(condition[0])
+        params += condition[1]
+        limit = limit or DEFAULT_PAGE_SIZE
+
+    sql = "SELECT * FROM events"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY " + sort_strategy.order_by()
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit + 1)
+
+    with get_db_connection() as conn:
+        db_cursor = conn.cursor()
+        db_cursor.execute(sql, params)
+        events = db_cursor.fetchall()
+
+    next_cursor = None
+    if limit and len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = encode_cursor([sort_strategy.name] + sort_strategy.cursor_values(last))
+
+    events_list = [event_to_dict(event) for event in events]
 
     unique_events = {e['id']: e for e in events_list}.values()
 
-    return list(unique_events)
+    return list(unique_events), next_cursor
+
+@app.get("/events/search", response_model=List[EventResponse])
+def search_events(q: str, limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE)):
+    match = build_match_query(q)
+    if not match:
+        return []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(SEARCH_SQL, (match, limit))
+        events = cursor.fetchall()
+
+    return [event_to_dict(event) for event in events]
+
+@app.get("/events/changes", response_model=EventChangesResponse)
+def get_event_changes(since: int = Query(0, ge=0), epoch: Optional[str] = None):
+    version = catalog_version.version
+    changes = None
+    if (epoch is None or epoch == catalog_version.epoch) and since <= version:
+        changes = change_log.changes_since(since)
+    return {
+        "epoch": catalog_version.epoch,
+        "version": version,
+        "reset": changes is None,
+        "changes": changes or [],
+    }
+
+STREAM_KEEPALIVE_SECONDS = 15
+
+@app.get("/events/stream")
+async def stream_availability(request: Request, event_id: Optional[List[int]] = Query(None)):
+    subscription = availability_broadcaster.subscribe(asyncio.get_running_loop(), event_id)
+
+    async def frames():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(subscription.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            availability_broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/events/{event_id}", response_model=EventResponse)
+def get_event(event_id: int, response: Response, if_none_match: Optional[str] = Header(None)):
+    etag = catalog_version.event_etag(event_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cache_key = ("event", event_id)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+            row = cursor.fetchone()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Event not found")
+        event = event_to_dict(row)
+        cached = (event, event_json_bytes(event) if FAST_JSON else None)
+        response_cache.put(cache_key, cached, generation, [event_id], listing=False)
+    event, body = cached
+
+    headers = {"Cache-Control": CATALOG_CACHE_CONTROL, "ETag": etag}
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    return event
+
+@app.get("/availability", response_model=AvailabilityResponse)
+def get_availability(event_id: Optional[List[int]] = Query(None), location: Optional[str] = None):
+    return {
+        "version": catalog_version.version,
+        "availability": availability_table.snapshot(event_id, location),
+    }
+
+@app.get("/locations", response_model=List[LocationResponse])
+def get_locations():
+    return location_index.locations()
+
+@app.get("/export/events.ndjson")
+def export_events():
+    return StreamingResponse(iter_ndjson(db_pool, "events"), media_type="application/x-ndjson")
+
+@app.get("/export/tickets.ndjson")
+def export_tickets():
+    return StreamingResponse(iter_ndjson(db_pool, "tickets"), media_type="application/x-ndjson")
 
 @app.post("/events/sample")
 def create_sample_events():
@@ -310,71 +1095,192 @@ def create_sample_events():
             }
         ]
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        for event in sample_events:
-            cursor.execute('''
-                INSERT INTO events (title, description, date, location, total_tickets, available_tickets, price)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event["title"],
-                event["description"],
-                event["date"],
-                event["location"],
-                event["total_tickets"],
-                event["total_tickets"],
-                event["price"]
-            ))
-
-        conn.commit()
-        conn.close()
+        cinema.add_movies([EventCreate(**event) for event in sample_events])
 
         return {"message": "Sample events created"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/tickets/purchase", response_model=TicketResponse)
-def purchase_ticket(ticket: TicketPurchase):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT * FROM events WHERE id = ?", (ticket.event_id,))
-    event = cursor.fetchone()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    if event["available_tickets"] < ticket.quantity:
-        raise HTTPException(status_code=400, detail="Not enough tickets")
-
-    total_price = event["price"] * ticket.quantity
-
-    cursor.execute('''
-        INSERT INTO tickets (event_id, customer_name, customer_email, quantity, total_price, is_paid)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        ticket.event_id,
-        ticket.customer_name,
-        ticket.customer_email,
-        ticket.quantity,
-        total_price,
-        True
-    ))
-
-    ticket_id = cursor.lastrowid
-
-    cursor.execute('''
-        UPDATE events
-        SET available_tickets = available_tickets - ?
-        WHERE id = ?
-    ''', (ticket.quantity, ticket.event_id))
-
-    conn.commit()
-
-    cursor.execute("SELECT * FROM tickets WHERE id = ?", (ticket_id,))
-    row = cursor.fetchone()
-    conn.close()
+def purchase_ticket(ticket: TicketPurchase, response: Response, idempotency_key: Optional[str] = Header(None)):
+    try:
+        if idempotency_key:
+            row = purchase_ticket_once(idempotency_key, ticket, response)
+        else:
+            row = cinema.purchase(ticket.event_id, ticket.customer_name, ticket.customer_email, ticket.quantity)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (NotEnoughTickets, InvalidQuantity) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return ticket_to_response(row)
+
+def purchase_ticket_once(key, ticket, response):
+    fingerprint = request_fingerprint({
+        "event_id": ticket.event_id,
+        "customer_name": ticket.customer_name,
+        "customer_email": ticket.customer_email,
+        "quantity": ticket.quantity,
+    })
+    now = int(time.time())
+    stored = idempotency_store.get(key, fingerprint, now)
+    if stored is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+        return stored
+    row, created_at, replayed = cinema.purchase_once(
+        key, fingerprint, now, ticket.event_id, ticket.customer_name, ticket.customer_email, ticket.quantity
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    idempotency_store.remember(key, created_at, fingerprint, row)
+    return row
+
+@app.post("/tickets/hold", response_model=HoldResponse)
+def hold_tickets(ticket: TicketPurchase):
+    try:
+        hold = cinema.hold(
+            ticket.event_id, ticket.customer_name, ticket.customer_email, ticket.quantity, HOLD_TTL_SECONDS
+        )
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (NotEnoughTickets, InvalidQuantity) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return HoldResponse(
+        id=hold["id"],
+        event_id=hold["event_id"],
+        customer_name=hold["customer_name"],
+        customer_email=hold["customer_email"],
+        quantity=hold["quantity"],
+        expires_at=hold["expires_at"],
+        seats=[Seat(row=seat_row, seat=seat) for seat_row, seat in parse_seats(hold["seats"])] or None
+    )
+
+@app.post("/tickets/hold/{hold_id}/confirm", response_model=TicketResponse)
+def confirm_hold(hold_id: int):
+    try:
+        row = cinema.confirm_hold(hold_id)
+    except (HoldNotFound, EventNotFound) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return ticket_to_response(row)
 
+@app.post("/tickets/hold/{hold_id}/release")
+def release_hold(hold_id: int):
+    try:
+        cinema.release_hold(hold_id)
+    except HoldNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Hold released successfully"}
+
+@app.post("/tickets/waitlist", response_model=WaitlistResponse)
+def join_waitlist(ticket: TicketPurchase):
+    try:
+        entry = cinema.join_waitlist(ticket.event_id, ticket.customer_name, ticket.customer_email, ticket.quantity)
+        _, position = cinema.waitlist_entry(entry["id"])
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TicketsAvailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except InvalidQuantity as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return waitlist_to_response(entry, position)
+
+@app.get("/tickets/waitlist/{entry_id}", response_model=WaitlistResponse)
+def get_waitlist_entry(entry_id: int):
+    try:
+        entry, position = cinema.waitlist_entry(entry_id)
+    except WaitlistEntryNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return waitlist_to_response(entry, position)
+
+@app.post("/tickets/waitlist/{entry_id}/leave")
+def leave_waitlist(entry_id: int):
+    try:
+        cinema.leave_waitlist(entry_id)
+    except WaitlistEntryNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Left the waitlist successfully"}
+
+def waitlist_to_response(entry, position):
+    return WaitlistResponse(
+        id=entry["id"],
+        event_id=entry["event_id"],
+        customer_name=entry["customer_name"],
+        customer_email=entry["customer_email"],
+        quantity=entry["quantity"],
+        ticket_id=entry["ticket_id"],
+        position=position
+    )
+
+@app.post("/events/{event_id}/seats", response_model=SeatMapResponse)
+def create_seat_map(event_id: int, layout: SeatMapCreate):
+    try:
+        seat_map = cinema.create_seat_map(event_id, layout.rows, layout.seats_per_row)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidSeat as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return seat_map_to_response(event_id, seat_map)
+
+@app.get("/events/{event_id}/seats", response_model=SeatMapResponse)
+def get_seat_map(event_id: int):
+    try:
+        seat_map = cinema.seat_map(event_id)
+    except SeatMapNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return seat_map_to_response(event_id, seat_map)
+
+def seat_map_to_response(event_id, seat_map):
+    return SeatMapResponse(
+        event_id=event_id,
+        rows=seat_map.rows,
+        seats_per_row=seat_map.seats_per_row,
+        available=seat_map.available(),
+        seats=seat_map.row_states()
+    )
+
+@app.post("/tickets/purchase/seats", response_model=TicketResponse)
+def purchase_seats(purchase: SeatPurchase):
+    try:
+        row = cinema.purchase_seats(
+            purchase.event_id,
+            purchase.customer_name,
+            purchase.customer_email,
+            [(seat.row, seat.seat) for seat in purchase.seats]
+        )
+    except (EventNotFound, SeatMapNotFound) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SeatUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (NotEnoughTickets, InvalidQuantity, InvalidSeat) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ticket_to_response(row)
+
+MAX_BATCH_LINES = 50
+
+@app.post("/tickets/purchase/batch", response_model=BatchPurchaseResponse)
+def purchase_ticket_batch(basket: BatchPurchase):
+    if not basket.lines:
+        raise HTTPException(status_code=400, detail="Basket is empty")
+    if len(basket.lines) > MAX_BATCH_LINES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_LINES} lines per basket")
+
+    lines = [
+        (line.event_id, line.quantity, TicketPricingFactory.create(line.ticket_type))
+        for line in basket.lines
+    ]
+    try:
+        rows = cinema.purchase_basket(basket.customer_name, basket.customer_email, lines)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (NotEnoughTickets, InvalidQuantity) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tickets = [ticket_to_response(row) for row in rows]
+    return BatchPurchaseResponse(tickets=tickets, total_price=sum(t.total_price for t in tickets))
+
+def ticket_to_response(row):
     return TicketResponse(
         id=row["id"],
         event_id=row["event_id"],
@@ -382,8 +1288,10 @@ def purchase_ticket(ticket: TicketPurchase):
         customer_email=row["customer_email"],
         quantity=row["quantity"],
         total_price=row["total_price"],
-        is_paid=bool(row["is_paid"])
+        is_paid=bool(row["is_paid"]),
+        seats=[Seat(row=seat_row, seat=seat) for seat_row, seat in parse_seats(row["seats"])] or None
     )
+
 @app.post("/events/remove/{event_id}")
 def remove_movie(event_id: int):
     command = RemoveMovieCommand(cinema, event_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from pydantic import BaseModel
@@ -14,11 +14,13 @@ class EventDB(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
+    title_key = Column(String)
     description = Column(String)
 
     genre = Column(String, nullable=True)
 
     date = Column(DateTime, nullable=False)
+    date_ts = Column(Integer)
     location = Column(String, nullable=False)
     total_tickets = Column(Integer, nullable=False)
     available_tickets = Column(Integer, nullable=False)
@@ -37,6 +39,50 @@ class TicketDB(Base):
     total_price = Column(Float, nullable=False)
     is_paid = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
+    seats = Column(String)
+
+
+class HoldDB(Base):
+    __tablename__ = "holds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, nullable=False)
+    customer_name = Column(String, nullable=False)
+    customer_email = Column(String, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    seats = Column(String)
+
+
+class IdempotencyKeyDB(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    response = Column(String, nullable=False)
+    created_at = Column(Integer, nullable=False)
+
+
+class SeatMapDB(Base):
+    __tablename__ = "seat_maps"
+
+    event_id = Column(Integer, primary_key=True)
+    rows = Column(Integer, nullable=False)
+    seats_per_row = Column(Integer, nullable=False)
+    taken = Column(LargeBinary, nullable=False)
+
+
+class WaitlistDB(Base):
+    __tablename__ = "waitlist"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, nullable=False)
+    customer_name = Column(String, nullable=False)
+    customer_email = Column(String, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    ticket_id = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
 
 
 # Pydantic Models
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+
+from observers.catalog_observer import CatalogObserver
+
+
+class Subscription:
+    def __init__(self, loop, event_ids=None, max_pending=256):
+        self.loop = loop
+        self.event_ids = set(event_ids) if event_ids else None
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def wants(self, event_id):
+        return self.event_ids is None or event_id in self.event_ids
+
+    def deliver(self, frame):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class AvailabilityBroadcaster(CatalogObserver):
+    def __init__(self, catalog_version):
+        self.catalog_version = catalog_version
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, loop, event_ids=None):
+        subscription = Subscription(loop, event_ids)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_id, available_tickets):
+        if not self._subscribers:
+            return
+        version = self.catalog_version.event_version(event_id)
+        data = json.dumps(
+            {"event_id": event_id, "available_tickets": available_tickets, "version": version},
+            separators=(",", ":"),
+        )
+        self.broadcast(event_id, f"id: {version}\nevent: availability\ndata: {data}\n\n")
+
+    def broadcast(self, event_id, frame):
+        with self._lock:
+            subscribers = [s for s in self._subscribers if s.wants(event_id)]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, frame)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def event_added(self, event):
+        self.publish(event["id"], event["available_tickets"])
+
+    def event_removed(self, event_id):
+        self.publish(event_id, None)
+
+    def availability_changed(self, event_id, available_tickets):
+        self.publish(event_id, available_tickets)
+
+    def waitlist_promoted(self, event_id, promotions):
+        if not self._subscribers:
+            return
+        data = json.dumps({"event_id": event_id, "promotions": promotions}, separators=(",", ":"))
+        self.broadcast(event_id, f"event: waitlist\ndata: {data}\n\n")
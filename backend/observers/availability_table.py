@@ -0,0 +1,53 @@
+import threading
+
+from observers.catalog_observer import CatalogObserver
+
+
+class AvailabilityTable(CatalogObserver):
+    def __init__(self):
+        self._available = {}
+        self._locations = {}
+        self._by_location = {}
+        self._lock = threading.Lock()
+
+    def load(self, events):
+        with self._lock:
+            self._available.clear()
+            self._locations.clear()
+            self._by_location.clear()
+            for event in events:
+                self._add(event["id"], event["location"], event["available_tickets"])
+
+    def _add(self, event_id, location, available_tickets):
+        key = location.lower()
+        self._available[event_id] = available_tickets
+        self._locations[event_id] = key
+        self._by_location.setdefault(key, set()).add(event_id)
+
+    def event_added(self, event):
+        with self._lock:
+            self._add(event["id"], event["location"], event["available_tickets"])
+
+    def event_removed(self, event_id):
+        with self._lock:
+            self._available.pop(event_id, None)
+            key = self._locations.pop(event_id, None)
+            if key is not None:
+                ids = self._by_location[key]
+                ids.discard(event_id)
+                if not ids:
+                    del self._by_location[key]
+
+    def availability_changed(self, event_id, available_tickets):
+        with self._lock:
+            if event_id in self._available:
+                self._available[event_id] = available_tickets
+
+    def snapshot(self, event_ids=None, location=None):
+        with self._lock:
+            ids = self._available.keys()
+            if location:
+                ids = self._by_location.get(location.lower(), set())
+            if event_ids:
+                ids = [event_id for event_id in event_ids if event_id in ids]
+            return {event_id: self._available[event_id] for event_id in ids}
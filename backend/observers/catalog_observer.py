@@ -0,0 +1,34 @@
+import threading
+
+
+class CatalogObserver:
+    def event_added(self, event):
+        pass
+
+    def event_removed(self, event_id):
+        pass
+
+    def availability_changed(self, event_id, available_tickets):
+        pass
+
+    def waitlist_promoted(self, event_id, promotions):
+        pass
+
+
+class CatalogSubject:
+    def __init__(self):
+        self._observers = []
+        self._notify_lock = threading.RLock()
+
+    def attach(self, observer):
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def detach(self, observer):
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def notify(self, method, *args):
+        with self._notify_lock:
+            for observer in self._observers:
+                getattr(observer, method)(*args)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from observers.catalog_observer import CatalogObserver
+
+
+class CatalogVersion(CatalogObserver):
+    def __init__(self):
+        self.epoch = format(time.time_ns(), "x")
+        self.version = 0
+        self._event_versions = {}
+        self._lock = threading.Lock()
+
+    def bump(self, event_id):
+        with self._lock:
+            self.version += 1
+            self._event_versions[event_id] = self.version
+            return self.version
+
+    def event_added(self, event):
+        self.bump(event["id"])
+
+    def event_removed(self, event_id):
+        self.bump(event_id)
+
+    def availability_changed(self, event_id, available_tickets):
+        self.bump(event_id)
+
+    def event_version(self, event_id):
+        return self._event_versions.get(event_id, 0)
+
+    def etag(self):
+        return f'"{self.epoch}-{self.version}"'
+
+    def event_etag(self, event_id):
+        return f'"{self.epoch}-{event_id}-{self.event_version(event_id)}"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+from observers.catalog_observer import CatalogObserver
+from services.event_serializer import event_to_dict
+
+
+class ChangeLog(CatalogObserver):
+    def __init__(self, catalog_version, max_entries=10000):
+        self.catalog_version = catalog_version
+        self.max_entries = max_entries
+        self.floor = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _record(self, event_id, change):
+        change["event_id"] = event_id
+        change["version"] = self.catalog_version.event_version(event_id)
+        with self._lock:
+            previous = self._entries.get(event_id)
+            if previous and previous["type"] == "removed" and change["type"] == "availability":
+                return
+            self._entries.pop(event_id, None)
+            if previous and previous["type"] == "added" and change["type"] == "availability":
+                event = dict(previous["event"], available_tickets=change["available_tickets"])
+                change = {"type": "added", "event_id": event_id, "version": change["version"], "event": event}
+            self._entries[event_id] = change
+            while len(self._entries) > self.max_entries:
+                _, dropped = self._entries.popitem(last=False)
+                self.floor = dropped["version"]
+
+    def event_added(self, event):
+        self._record(event["id"], {"type": "added", "event": event_to_dict(event)})
+
+    def event_removed(self, event_id):
+        self._record(event_id, {"type": "removed"})
+
+    def availability_changed(self, event_id, available_tickets):
+        self._record(event_id, {"type": "availability", "available_tickets": available_tickets})
+
+    def changes_since(self, since):
+        with self._lock:
+            if since < self.floor:
+                return None
+            changes = []
+            for change in reversed(self._entries.values()):
+                if change["version"] <= since:
+                    break
+                changes.append(change)
+        changes.reverse()
+        return changes
@@ -0,0 +1,52 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from observers.catalog_observer import CatalogObserver
+from services.event_dates import to_timestamp
+
+
+class LocationIndex(CatalogObserver):
+    def __init__(self):
+        self._shows = {}
+        self._names = {}
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def load(self, events):
+        with self._lock:
+            self._shows.clear()
+            self._names.clear()
+            self._events.clear()
+            for event in events:
+                self._add(event["id"], event["location"], event["date_ts"])
+
+    def _add(self, event_id, location, date_ts):
+        key = location.lower()
+        self._names.setdefault(key, location)
+        self._events[event_id] = (key, date_ts)
+        insort(self._shows.setdefault(key, []), (date_ts, event_id))
+
+    def event_added(self, event):
+        with self._lock:
+            self._add(event["id"], event["location"], event["date_ts"])
+
+    def event_removed(self, event_id):
+        with self._lock:
+            entry = self._events.pop(event_id, None)
+            if entry is None:
+                return
+            key, date_ts = entry
+            shows = self._shows[key]
+            del shows[bisect_left(shows, (date_ts, event_id))]
+            if not shows:
+                del self._shows[key]
+                del self._names[key]
+
+    def locations(self, now=None):
+        now = to_timestamp(now or datetime.now())
+        with self._lock:
+            return [
+                {"location": self._names[key], "upcoming_events": len(shows) - bisect_left(shows, (now,))}
+                for key, shows in sorted(self._shows.items())
+            ]
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+from observers.catalog_observer import CatalogObserver
+
+
+class ResponseCache(CatalogObserver):
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._keys_by_event = {}
+        self._listing_keys = set()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, generation, event_ids, listing=True):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._drop(key)
+            self._entries[key] = (value, tuple(event_ids))
+            for event_id in event_ids:
+                self._keys_by_event.setdefault(event_id, set()).add(key)
+            if listing:
+                self._listing_keys.add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._listing_keys.discard(key)
+        for event_id in entry[1]:
+            keys = self._keys_by_event.get(event_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_event[event_id]
+
+    def invalidate_event(self, event_id):
+        with self._lock:
+            self.generation += 1
+            for key in list(self._keys_by_event.get(event_id, ())):
+                self._drop(key)
+
+    def invalidate_listings(self):
+        with self._lock:
+            self.generation += 1
+            for key in list(self._listing_keys):
+                self._drop(key)
+
+    def event_added(self, event):
+        self.invalidate_listings()
+
+    def event_removed(self, event_id):
+        self.invalidate_event(event_id)
+        self.invalidate_listings()
+
+    def availability_changed(self, event_id, available_tickets):
+        self.invalidate_event(event_id)
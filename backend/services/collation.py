@@ -0,0 +1,21 @@
+import unicodedata
+
+ROMANIAN_LETTERS = {
+    "ă": "a1",
+    "â": "a2",
+    "î": "i1",
+    "ș": "s1",
+    "ş": "s1",
+    "ț": "t1",
+    "ţ": "t1",
+}
+
+
+def title_sort_key(title):
+    parts = []
+    for char in unicodedata.normalize("NFC", (title or "").casefold()):
+        if char in ROMANIAN_LETTERS:
+            parts.append(ROMANIAN_LETTERS[char])
+        else:
+            parts.append(unicodedata.normalize("NFD", char)[0] + "0")
+    return "".join(parts)
@@ -0,0 +1,9 @@
+from datetime import datetime, timezone
+
+
+def to_timestamp(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
@@ -0,0 +1,27 @@
+import json
+
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+EVENT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "date",
+    "location",
+    "genre",
+    "total_tickets",
+    "available_tickets",
+    "price",
+)
+
+
+def event_to_dict(event):
+    return {name: event[name] for name in EVENT_FIELDS}
+
+
+def events_json(events):
+    return _encoder.encode([event_to_dict(event) for event in events]).encode("utf-8")
+
+
+def event_json_bytes(event):
+    return _encoder.encode(event_to_dict(event)).encode("utf-8")
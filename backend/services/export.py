@@ -0,0 +1,21 @@
+import json
+
+EXPORT_TABLES = ("events", "tickets")
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_ndjson(pool, table, chunk_size=EXPORT_CHUNK_SIZE):
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table '{table}'")
+    last_id = 0
+    while True:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, chunk_size))
+            rows = cursor.fetchall()
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        yield "".join(json.dumps(dict(row), ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+        if len(rows) < chunk_size:
+            return
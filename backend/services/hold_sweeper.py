@@ -0,0 +1,65 @@
+import heapq
+import threading
+import time
+
+
+class HoldSweeper:
+    def __init__(self, release_expired, batch_size=500, retry_delay=5):
+        self.release_expired = release_expired
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._heap = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="hold-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def schedule(self, hold_id, expires_at):
+        with self._condition:
+            heapq.heappush(self._heap, (expires_at, hold_id))
+            if self._heap[0][1] == hold_id:
+                self._condition.notify()
+        if not self._running:
+            self.start()
+
+    def _next_due(self):
+        with self._condition:
+            while self._running:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    due = []
+                    while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                        due.append(heapq.heappop(self._heap)[1])
+                    return due
+                self._condition.wait(self._heap[0][0] - now if self._heap else None)
+            return None
+
+    def _run(self):
+        while True:
+            due = self._next_due()
+            if due is None:
+                return
+            try:
+                self.release_expired(due)
+            except Exception as e:
+                print(f"Releasing expired holds failed: {e}")
+                retry_at = time.time() + self.retry_delay
+                with self._condition:
+                    for hold_id in due:
+                        heapq.heappush(self._heap, (retry_at, hold_id))
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+class IdempotencyMismatch(Exception):
+    pass
+
+
+def request_fingerprint(payload):
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, ttl_seconds=86400, max_entries=100000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, rows, now):
+        with self._lock:
+            self._entries.clear()
+            for row in sorted(rows, key=lambda r: r["created_at"]):
+                if row["created_at"] >= now - self.ttl_seconds:
+                    self._entries[row["key"]] = (row["created_at"], row["fingerprint"], json.loads(row["response"]))
+
+    def evict_expired(self, now):
+        cutoff = now - self.ttl_seconds
+        evicted = 0
+        while self._entries:
+            key, (created_at, _, _) = next(iter(self._entries.items()))
+            if created_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+            evicted += 1
+        return evicted
+
+    def get(self, key, fingerprint, now):
+        with self._lock:
+            self.evict_expired(now)
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] != fingerprint:
+            raise IdempotencyMismatch("Idempotency-Key was already used for a different purchase")
+        return entry[2]
+
+    def remember(self, key, created_at, fingerprint, response):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (created_at, fingerprint, response)
+            self.evict_expired(created_at)
@@ -0,0 +1,114 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class PurchaseWriter:
+    def __init__(self, pool, window=0.002, max_batch=256):
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="purchase-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if not self._thread:
+                return
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def submit(self, work, *args, on_commit=None):
+        future = Future()
+        self._queue.put((future, work, args, on_commit))
+        if not self._thread:
+            self.start()
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self.pool.open_dedicated()
+        return self._conn
+
+    def _reset_connection(self):
+        try:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+        except sqlite3.Error:
+            self._conn.close()
+            self._conn = None
+
+    def _commit(self, batch):
+        results = []
+        try:
+            conn = self._connection()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            for future, work, args, on_commit in batch:
+                cursor.execute("SAVEPOINT purchase")
+                try:
+                    result = work(cursor, *args)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO purchase")
+                    cursor.execute("RELEASE purchase")
+                    results.append((future, None, e, None))
+                    continue
+                cursor.execute("RELEASE purchase")
+                results.append((future, result, None, on_commit))
+            conn.commit()
+        except Exception as e:
+            if self._conn is not None:
+                self._reset_connection()
+            for future, _, _, _ in batch:
+                future.set_exception(e)
+            return
+
+        for future, result, error, on_commit in results:
+            if error is not None:
+                future.set_exception(error)
+                continue
+            if on_commit:
+                try:
+                    on_commit(result)
+                except Exception as e:
+                    print(f"Post-commit hook failed: {e}")
+            future.set_result(result)
@@ -0,0 +1,147 @@
+PREFERRED_ROW = 0.6
+ROW_WEIGHT = 2
+
+
+class InvalidSeat(Exception):
+    pass
+
+
+class SeatUnavailable(Exception):
+    pass
+
+
+class SeatMap:
+    def __init__(self, rows, seats_per_row, taken=0):
+        if rows <= 0 or seats_per_row <= 0:
+            raise InvalidSeat("A seat map needs at least one row and one seat per row")
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        self.taken = taken
+
+    @property
+    def capacity(self):
+        return self.rows * self.seats_per_row
+
+    @classmethod
+    def from_blob(cls, rows, seats_per_row, blob):
+        return cls(rows, seats_per_row, cls.decode(blob))
+
+    def to_blob(self):
+        return self.encode(self.taken)
+
+    def encode(self, mask):
+        return mask.to_bytes((self.capacity + 7) // 8, "little")
+
+    @staticmethod
+    def decode(blob):
+        return int.from_bytes(blob or b"", "little")
+
+    def index(self, row, seat):
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_per_row):
+            raise InvalidSeat(f"Seat {row}-{seat} is outside the hall")
+        return (row - 1) * self.seats_per_row + seat - 1
+
+    def position(self, index):
+        row, seat = divmod(index, self.seats_per_row)
+        return row + 1, seat + 1
+
+    def mask(self, seats):
+        mask = 0
+        for row, seat in seats:
+            bit = 1 << self.index(row, seat)
+            if mask & bit:
+                raise InvalidSeat(f"Seat {row}-{seat} is listed twice")
+            mask |= bit
+        return mask
+
+    def seats(self, mask):
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(self.position(low.bit_length() - 1))
+            mask ^= low
+        return positions
+
+    def available(self):
+        return self.capacity - self.taken.bit_count()
+
+    def is_taken(self, row, seat):
+        return bool(self.taken >> self.index(row, seat) & 1)
+
+    def claim(self, mask):
+        clash = self.taken & mask
+        if clash:
+            taken = ", ".join(f"{row}-{seat}" for row, seat in self.seats(clash))
+            raise SeatUnavailable(f"Seats already taken: {taken}")
+        self.taken |= mask
+
+    def release(self, mask):
+        self.taken &= ~mask
+
+    def start_mask(self, quantity):
+        row_starts = (1 << (self.seats_per_row - quantity + 1)) - 1
+        every_row = ((1 << self.capacity) - 1) // ((1 << self.seats_per_row) - 1)
+        return row_starts * every_row
+
+    def contiguous_starts(self, quantity):
+        runs = ~self.taken & ((1 << self.capacity) - 1)
+        span = 1
+        while span < quantity:
+            step = min(span, quantity - span)
+            runs &= runs >> step
+            span += step
+        return runs & self.start_mask(quantity)
+
+    def best_available(self, quantity):
+        if not 1 <= quantity <= self.seats_per_row:
+            return None
+        starts = self.contiguous_starts(quantity)
+        if not starts:
+            return None
+
+        center = (self.seats_per_row - quantity) // 2
+        preferred_row = int((self.rows - 1) * PREFERRED_ROW)
+        row_starts = (1 << (self.seats_per_row - quantity + 1)) - 1
+        best = None
+        for row in sorted(range(self.rows), key=lambda r: (abs(r - preferred_row), r)):
+            penalty = abs(row - preferred_row) * ROW_WEIGHT
+            if best and penalty >= best[0]:
+                break
+            bits = starts >> (row * self.seats_per_row) & row_starts
+            if not bits:
+                continue
+            candidates = []
+            right = bits >> center
+            if right:
+                candidates.append(center + (right & -right).bit_length() - 1)
+            left = bits & ((1 << center) - 1)
+            if left:
+                candidates.append(left.bit_length() - 1)
+            start = min(candidates, key=lambda seat: abs(seat - center))
+            score = penalty + abs(start - center)
+            if not best or score < best[0]:
+                best = (score, row, start)
+
+        _, row, start = best
+        return [(row + 1, start + seat + 1) for seat in range(quantity)]
+
+    def row_states(self):
+        states = []
+        row_mask = (1 << self.seats_per_row) - 1
+        for row in range(self.rows):
+            bits = self.taken >> (row * self.seats_per_row) & row_mask
+            states.append("".join("x" if bits >> seat & 1 else "." for seat in range(self.seats_per_row)))
+        return states
+
+
+def format_seats(seats):
+    return ",".join(f"{row}-{seat}" for row, seat in seats)
+
+
+def parse_seats(text):
+    seats = []
+    for part in (text or "").split(","):
+        if part:
+            row, seat = part.split("-")
+            seats.append((int(row), int(seat)))
+    return seats
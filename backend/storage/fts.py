@@ -0,0 +1,64 @@
+import re
+
+FTS_TABLE = "events_fts"
+
+FTS_SCHEMA = [
+    f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            title,
+            description,
+            content='events',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''',
+    f'''
+        CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    ''',
+    f'''
+        CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    ''',
+    f'''
+        CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description ON events BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    ''',
+]
+
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SEARCH_SQL = f'''
+    SELECT events.*
+    FROM {FTS_TABLE}
+    JOIN events ON events.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH ?
+    ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}), events.id
+    LIMIT ?
+'''
+
+
+def ensure_fts(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,))
+    existed = cursor.fetchone() is not None
+    for statement in FTS_SCHEMA:
+        cursor.execute(statement)
+    if not existed:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+    return not existed
+
+
+def build_match_query(text):
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
@@ -0,0 +1,65 @@
+MANAGED_INDEXES = {
+    "idx_events_date": "events (date_ts, id)",
+    "idx_events_location_date": "events (location COLLATE NOCASE, date_ts, id)",
+    "idx_events_genre": "events (genre COLLATE NOCASE, date_ts, id)",
+    "idx_events_price": "events (price, id)",
+    "idx_events_title_key": "events (title_key, id)",
+    "idx_events_location_title_key": "events (location COLLATE NOCASE, title_key, id)",
+    "idx_tickets_event_id": "tickets (event_id)",
+    "idx_tickets_customer_email": "tickets (customer_email)",
+    "idx_idempotency_keys_created_at": "idempotency_keys (created_at)",
+    "idx_waitlist_event_pending": "waitlist (event_id, id) WHERE ticket_id IS NULL",
+}
+
+QUERY_PLAN_CHECKS = [
+    ("SELECT * FROM events ORDER BY date_ts, id", (), "idx_events_date"),
+    ("SELECT * FROM events WHERE date_ts >= ? AND date_ts <= ? ORDER BY date_ts, id", (0, 0), "idx_events_date"),
+    ("SELECT * FROM events WHERE location = ? COLLATE NOCASE ORDER BY date_ts, id", ("",), "idx_events_location_date"),
+    ("SELECT * FROM events WHERE genre = ? COLLATE NOCASE ORDER BY date_ts, id", ("",), "idx_events_genre"),
+    ("SELECT * FROM events ORDER BY price, id", (), "idx_events_price"),
+    ("SELECT * FROM events ORDER BY title_key DESC, id DESC", (), "idx_events_title_key"),
+    ("SELECT * FROM events WHERE location = ? COLLATE NOCASE ORDER BY title_key, id", ("",),
+     "idx_events_location_title_key"),
+    ("SELECT * FROM tickets WHERE event_id = ?", (0,), "idx_tickets_event_id"),
+    ("SELECT * FROM tickets WHERE customer_email = ?", ("",), "idx_tickets_customer_email"),
+    ("SELECT * FROM waitlist WHERE event_id = ? AND ticket_id IS NULL AND id > ? ORDER BY id", (0, 0),
+     "idx_waitlist_event_pending"),
+]
+
+
+def _normalize(sql):
+    return " ".join((sql or "").replace("(", " ( ").replace(")", " ) ").replace(",", " , ").split()).upper()
+
+
+def ensure_indexes(cursor):
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0]: row[1] for row in cursor.fetchall()}
+    created = []
+    for name, definition in MANAGED_INDEXES.items():
+        statement = f"CREATE INDEX {name} ON {definition}"
+        if name in existing and _normalize(existing[name]) == _normalize(statement):
+            continue
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute(statement)
+        created.append(name)
+    return created
+
+
+def query_plan(cursor, sql, params=()):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    return [row[3] for row in cursor.fetchall()]
+
+
+def verify_indexes(cursor):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0] for row in cursor.fetchall()}
+    problems = [f"missing index {name}" for name in MANAGED_INDEXES if name not in existing]
+
+    for sql, params, index_name in QUERY_PLAN_CHECKS:
+        plan = query_plan(cursor, sql, params)
+        uses_index = any(index_name in step for step in plan)
+        full_scan = any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+        temp_sort = any("TEMP B-TREE" in step for step in plan)
+        if not uses_index or full_scan or temp_sort:
+            problems.append(f"'{sql}' does not use {index_name}: {'; '.join(plan)}")
+    return problems
@@ -0,0 +1,37 @@
+from services.collation import title_sort_key
+from services.event_dates import to_timestamp
+
+
+def table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def ensure_column(cursor, table, column, definition):
+    if column not in table_columns(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def backfill(cursor, table, column, source, compute):
+    cursor.execute(f"SELECT id, {source} FROM {table} WHERE {column} IS NULL")
+    updates = [(compute(event_id, value), event_id) for event_id, value in cursor.fetchall()]
+    cursor.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+    return len(updates)
+
+
+def _date_timestamp(event_id, date):
+    try:
+        return to_timestamp(str(date))
+    except ValueError:
+        print(f"Event {event_id} has an unparsable date '{date}', sorting it first.")
+        return 0
+
+
+def ensure_date_ts(cursor):
+    ensure_column(cursor, "events", "date_ts", "INTEGER")
+    return backfill(cursor, "events", "date_ts", "date", _date_timestamp)
+
+
+def ensure_title_key(cursor):
+    ensure_column(cursor, "events", "title_key", "TEXT")
+    return backfill(cursor, "events", "title_key", "title", lambda _, title: title_sort_key(title))
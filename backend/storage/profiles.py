@@ -0,0 +1,42 @@
+STORAGE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "mmap_size": 0,
+        "cache_size": -8000,
+        "temp_store": "DEFAULT",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 268435456,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+    },
+}
+
+SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def get_profile(name):
+    try:
+        return STORAGE_PROFILES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown storage profile '{name}' ({' / '.join(STORAGE_PROFILES)})")
+
+
+def effective_settings(conn):
+    settings = {}
+    for name in STORAGE_PROFILES["fast"]:
+        value = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        if name == "synchronous":
+            value = SYNCHRONOUS_NAMES.get(value, value)
+        elif name == "temp_store":
+            value = TEMP_STORE_NAMES.get(value, value)
+        elif name == "journal_mode":
+            value = value.upper()
+        settings[name] = value
+    return settings
@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+
+from services.event_dates import to_timestamp
+
+
+class EventFilterStrategy(ABC):
+    @abstractmethod
+    def where(self):
+        pass
+
+
+class SearchFilterStrategy(EventFilterStrategy):
+    def __init__(self, search_text):
+        self.search_text = (search_text or "").strip()
+
+    def where(self):
+        if not self.search_text:
+            return None
+        escaped = self.search_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "title LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+
+
+class GenreFilterStrategy(EventFilterStrategy):
+    def __init__(self, selected_genre):
+        self.selected_genre = selected_genre or "Toate"
+
+    def where(self):
+        if self.selected_genre == "Toate":
+            return None
+        return "genre = ? COLLATE NOCASE", [self.selected_genre]
+
+
+class LocationFilterStrategy(EventFilterStrategy):
+    def __init__(self, location):
+        self.location = location
+
+    def where(self):
+        if not self.location:
+            return None
+        return "location = ? COLLATE NOCASE", [self.location]
+
+
+class DateRangeFilterStrategy(EventFilterStrategy):
+    def __init__(self, start=None, end=None):
+        self.start = start
+        self.end = end
+
+    def where(self):
+        clauses = []
+        params = []
+        if self.start is not None:
+            clauses.append("date_ts >= ?")
+            params.append(to_timestamp(self.start))
+        if self.end is not None:
+            clauses.append("date_ts <= ?")
+            params.append(to_timestamp(self.end))
+        if not clauses:
+            return None
+        return " AND ".join(clauses), params
+
+
+class CompositeFilterStrategy(EventFilterStrategy):
+    def __init__(self, strategies=None):
+        self.strategies = strategies or []
+
+    def where(self):
+        clauses = []
+        params = []
+        for strategy in self.strategies:
+            condition = strategy.where()
+            if condition:
+                clauses.append(f"({condition[0]})")
+                params += condition[1]
+        if not clauses:
+            return None
+        return " AND ".join(clauses), params
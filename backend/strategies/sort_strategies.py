@@ -0,0 +1,53 @@
+from abc import ABC
+
+
+class EventSortStrategy(ABC):
+    column = None
+
+    def __init__(self, descending=False):
+        self.descending = descending
+
+    @property
+    def name(self):
+        return ("-" if self.descending else "") + self.key
+
+    def order_by(self):
+        direction = "DESC" if self.descending else "ASC"
+        return f"{self.column} {direction}, id {direction}"
+
+    def after(self, value, event_id):
+        operator = "<" if self.descending else ">"
+        return f"({self.column}, id) {operator} (?, ?)", [value, event_id]
+
+    def cursor_values(self, row):
+        return [row[self.column], row["id"]]
+
+
+class SortByDateStrategy(EventSortStrategy):
+    key = "date"
+    column = "date_ts"
+
+
+class SortByPriceStrategy(EventSortStrategy):
+    key = "price"
+    column = "price"
+
+
+class SortByTitleStrategy(EventSortStrategy):
+    key = "title"
+    column = "title_key"
+
+
+SORT_STRATEGIES = {
+    strategy.key: strategy
+    for strategy in (SortByDateStrategy, SortByPriceStrategy, SortByTitleStrategy)
+}
+
+
+def create_sort_strategy(sort):
+    descending = sort.startswith("-")
+    key = sort[1:] if descending else sort
+    if key not in SORT_STRATEGIES:
+        options = ", ".join(f"{k} / -{k}" for k in SORT_STRATEGIES)
+        raise ValueError(f"Invalid sort ({options})")
+    return SORT_STRATEGIES[key](descending)
@@ -0,0 +1,33 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    previous = os.environ.get("DB_PATH")
+    os.environ["DB_PATH"] = str(tmp_path_factory.mktemp("db") / "tickets.db")
+    try:
+        module = importlib.import_module("main")
+        module.purchase_writer.start()
+        yield module
+        module.purchase_writer.stop()
+    finally:
+        if previous is None:
+            os.environ.pop("DB_PATH", None)
+        else:
+            os.environ["DB_PATH"] = previous
+
+
+@pytest.fixture
+def add_event(main):
+    def add(total_tickets):
+        return main.cinema.add_movie(main.EventCreate(
+            title="Test", description="", date="2030-01-01T19:00:00", location="Cluj",
+            total_tickets=total_tickets, price=10,
+        ))
+    return add
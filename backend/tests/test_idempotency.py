@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.idempotency import IdempotencyMismatch, IdempotencyStore
+
+
+@pytest.fixture
+def client(main):
+    return TestClient(main.app)
+
+
+def purchase(client, event_id, key, quantity=1, name="Ana"):
+    return client.post(
+        "/tickets/purchase",
+        json={"event_id": event_id, "customer_name": name, "customer_email": "ana@example.com", "quantity": quantity},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def available(client, event_id):
+    return client.get(f"/events/{event_id}").json()["available_tickets"]
+
+
+def test_same_key_buys_once(client, add_event):
+    event_id = add_event(10)
+    first = purchase(client, event_id, "same-key", quantity=2)
+    second = purchase(client, event_id, "same-key", quantity=2)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["id"] == first.json()["id"]
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert available(client, event_id) == 8
+
+
+def test_replay_found_only_in_the_database(main, client, add_event):
+    event_id = add_event(10)
+    first = purchase(client, event_id, "stored-key")
+    main.idempotency_store.load([], int(time.time()))
+
+    second = purchase(client, event_id, "stored-key")
+
+    assert second.json()["id"] == first.json()["id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert available(client, event_id) == 9
+
+
+def test_same_key_with_different_body_is_rejected(client, add_event):
+    event_id = add_event(10)
+    purchase(client, event_id, "mismatch-key")
+    response = purchase(client, event_id, "mismatch-key", name="Ion")
+
+    assert response.status_code == 422
+    assert available(client, event_id) == 9
+
+
+def test_expired_keys_are_purged(main, client, add_event):
+    event_id = add_event(10)
+    first = purchase(client, event_id, "old-key")
+    with main.get_db_connection() as conn:
+        conn.execute("UPDATE idempotency_keys SET created_at = 0 WHERE key = 'old-key'")
+        conn.commit()
+    main.idempotency_store.load([], int(time.time()))
+
+    second = purchase(client, event_id, "old-key")
+
+    assert second.json()["id"] != first.json()["id"]
+    assert "Idempotent-Replayed" not in second.headers
+    assert available(client, event_id) == 8
+
+
+def test_store_evicts_after_ttl():
+    store = IdempotencyStore(ttl_seconds=60)
+    store.remember("key", 1000, "fingerprint", {"id": 1})
+
+    assert store.get("key", "fingerprint", 1060) == {"id": 1}
+    with pytest.raises(IdempotencyMismatch):
+        store.get("key", "other", 1060)
+    assert store.get("key", "fingerprint", 1061) is None
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from services.purchase_writer import PurchaseWriter
+from storage.connection_pool import ConnectionPool
+
+
+def test_failing_item_does_not_roll_back_its_batch(tmp_path):
+    database = str(tmp_path / "writer.db")
+    with sqlite3.connect(database) as conn:
+        conn.execute("CREATE TABLE items (name TEXT UNIQUE)")
+    pool = ConnectionPool(database)
+    writer = PurchaseWriter(pool, window=0.5)
+    cursors = []
+
+    def insert(cursor, name):
+        cursors.append(cursor)
+        cursor.execute("INSERT INTO items (name) VALUES (?)", (name,))
+        if name == "bad":
+            raise ValueError("rejected")
+        return name
+
+    try:
+        futures = [writer.submit(insert, name) for name in ("first", "bad", "last")]
+        assert futures[0].result(timeout=5) == "first"
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5) == "last"
+    finally:
+        writer.stop()
+        pool.close()
+
+    with sqlite3.connect(database) as conn:
+        names = [row[0] for row in conn.execute("SELECT name FROM items ORDER BY rowid")]
+    assert names == ["first", "last"]
+    assert len(cursors) == 3 and all(cursor is cursors[0] for cursor in cursors)
+
+
+def test_writer_does_not_need_a_pool_connection(tmp_path):
+    database = str(tmp_path / "writer.db")
+    with sqlite3.connect(database) as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+    pool = ConnectionPool(database, size=1, timeout=0.1)
+    writer = PurchaseWriter(pool)
+    reader = pool.acquire()
+    try:
+        future = writer.submit(lambda cursor: cursor.execute("INSERT INTO items VALUES ('x')").rowcount)
+        assert future.result(timeout=5) == 1
+    finally:
+        pool.release(reader)
+        writer.stop()
+        pool.close()
@@ -0,0 +1,30 @@
+import threading
+
+
+def test_concurrent_purchases_never_oversell(main, add_event):
+    event_id = add_event(50)
+    sold = []
+    rejected = []
+
+    def buy(quantity):
+        for _ in range(5):
+            try:
+                ticket = main.cinema.purchase(event_id, "Ana", "ana@example.com", quantity)
+                sold.append(ticket["quantity"])
+            except main.NotEnoughTickets:
+                rejected.append(quantity)
+
+    threads = [threading.Thread(target=buy, args=(i % 3 + 1,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with main.get_db_connection() as conn:
+        event = conn.execute("SELECT total_tickets, available_tickets FROM events WHERE id = ?", (event_id,)).fetchone()
+        stored = conn.execute("SELECT COALESCE(SUM(quantity), 0) FROM tickets WHERE event_id = ?", (event_id,)).fetchone()[0]
+
+    assert rejected
+    assert event["available_tickets"] >= 0
+    assert sum(sold) == stored
+    assert sum(sold) + event["available_tickets"] == event["total_tickets"]
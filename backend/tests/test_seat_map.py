@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from services.seat_map import PREFERRED_ROW, ROW_WEIGHT, InvalidSeat, SeatMap, SeatUnavailable
+
+
+def random_map(rng):
+    seat_map = SeatMap(rng.randint(1, 12), rng.randint(1, 20))
+    occupancy = rng.random()
+    for index in range(seat_map.capacity):
+        if rng.random() < occupancy:
+            seat_map.taken |= 1 << index
+    return seat_map
+
+
+def brute_force_starts(seat_map, quantity):
+    starts = set()
+    for row in range(1, seat_map.rows + 1):
+        for seat in range(1, seat_map.seats_per_row - quantity + 2):
+            if not any(seat_map.is_taken(row, seat + offset) for offset in range(quantity)):
+                starts.add((row, seat))
+    return starts
+
+
+def score(seat_map, seats):
+    row, seat = seats[0]
+    center = (seat_map.seats_per_row - len(seats)) // 2
+    preferred_row = int((seat_map.rows - 1) * PREFERRED_ROW)
+    return abs(row - 1 - preferred_row) * ROW_WEIGHT + abs(seat - 1 - center)
+
+
+def test_contiguous_starts_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        seat_map = random_map(rng)
+        for quantity in range(1, seat_map.seats_per_row + 1):
+            starts = set(seat_map.seats(seat_map.contiguous_starts(quantity)))
+            assert starts == brute_force_starts(seat_map, quantity)
+
+
+def test_runs_never_cross_a_row():
+    seat_map = SeatMap(2, 5)
+    seat_map.claim(seat_map.mask([(1, 1), (1, 2), (1, 3), (2, 3), (2, 4), (2, 5)]))
+
+    assert seat_map.contiguous_starts(3) == 0
+    assert seat_map.best_available(3) is None
+    assert seat_map.best_available(2) in ([(1, 4), (1, 5)], [(2, 1), (2, 2)])
+
+
+def test_best_available_is_free_adjacent_and_optimal():
+    rng = random.Random(11)
+    for _ in range(300):
+        seat_map = random_map(rng)
+        for quantity in range(1, seat_map.seats_per_row + 1):
+            seats = seat_map.best_available(quantity)
+            expected = brute_force_starts(seat_map, quantity)
+            if not expected:
+                assert seats is None
+                continue
+            assert len({row for row, _ in seats}) == 1
+            assert [seat for _, seat in seats] == list(range(seats[0][1], seats[0][1] + quantity))
+            assert not seat_map.taken & seat_map.mask(seats)
+            best = min(score(seat_map, [(row, seat)] * quantity) for row, seat in expected)
+            assert score(seat_map, seats) == best
+
+
+def test_claim_conflict_raises_and_leaves_map_unchanged():
+    seat_map = SeatMap(3, 4)
+    seat_map.claim(seat_map.mask([(2, 2)]))
+    before = seat_map.taken
+
+    with pytest.raises(SeatUnavailable):
+        seat_map.claim(seat_map.mask([(2, 1), (2, 2), (2, 3)]))
+    assert seat_map.taken == before
+
+    seat_map.release(seat_map.mask([(2, 2)]))
+    seat_map.claim(seat_map.mask([(2, 1), (2, 2), (2, 3)]))
+    assert seat_map.available() == 9
+
+
+def test_invalid_seats_are_rejected():
+    seat_map = SeatMap(3, 4)
+    with pytest.raises(InvalidSeat):
+        seat_map.mask([(4, 1)])
+    with pytest.raises(InvalidSeat):
+        seat_map.mask([(1, 1), (1, 1)])
+
+
+def test_blob_round_trip_is_compact():
+    seat_map = SeatMap(20, 25)
+    seat_map.claim(seat_map.mask([(1, 1), (10, 13), (20, 25)]))
+    blob = seat_map.to_blob()
+
+    assert len(blob) <= 63
+    restored = SeatMap.from_blob(20, 25, blob)
+    assert restored.taken == seat_map.taken
+    assert restored.available() == 497
+    assert restored.is_taken(20, 25) and not restored.is_taken(20, 24)
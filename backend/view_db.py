@@ -8,13 +8,13 @@ cursor = conn.cursor()
 # Afișează toate evenimentele
 print("Evenimente:")
 cursor.execute("SELECT * FROM events")
-for row in cursor.fetchall():
+for row in cursor:
     print(dict(row))
 
 # Afișează toate biletele
 print("\nBilete:")
 cursor.execute("SELECT * FROM tickets")
-for row in cursor.fetchall():
+for row in cursor:
     print(dict(row))
 
 conn.close()
@@ -51,18 +51,11 @@ export default function BuyTicket() {
 
     const loadEvents = async () => {
       try {
-        const res = await fetch(`${API}/events/`);
+        // only from selected cinema, sorted alphabetically by the server
+        const params = new URLSearchParams({ location, sort: "title" });
+        const res = await fetch(`${API}/events/?${params}`);
         const data = await res.json();
-
-        // only from selected cinema
-        const byLocation = (data || []).filter(
-          (e) => (e.location || "").toLowerCase() === (location || "").toLowerCase()
-        );
-
-        // sort alphabetically
-        byLocation.sort((a, b) =>
-          (a.title || "").localeCompare((b.title || ""), "ro", { sensitivity: "base" })
-        );
+        const byLocation = data || [];
 
         setAllEvents(byLocation);
 
@@ -84,10 +77,8 @@ export default function BuyTicket() {
 
     const load = async () => {
       try {
-        const res = await fetch(`${API}/events/`);
-        const data = await res.json();
-        const found = (data || []).find((e) => String(e.id) === String(eventId));
-        setEvent(found || null);
+        const res = await fetch(`${API}/events/${eventId}`);
+        setEvent(res.ok ? await res.json() : null);
       } catch (e) {
         setEvent(null);
       }
@@ -96,6 +87,23 @@ export default function BuyTicket() {
     load();
   }, [isCheckoutMode, eventId]);
 
+  // Live availability updates for the event being bought
+  useEffect(() => {
+    if (!isCheckoutMode) return;
+
+    const source = new EventSource(`${API}/events/stream?event_id=${eventId}`);
+    source.addEventListener("availability", (msg) => {
+      const delta = JSON.parse(msg.data);
+      setEvent((prev) =>
+        prev && String(prev.id) === String(delta.event_id) && delta.available_tickets !== null
+          ? { ...prev, available_tickets: delta.available_tickets }
+          : prev
+      );
+    });
+
+    return () => source.close();
+  }, [isCheckoutMode, eventId]);
+
   // =========================
   // Helpers
   // =========================
@@ -229,10 +237,8 @@ const handleCancelTicket = async () => {
     
     if (response.ok) {
      
-      const res = await fetch(`${API}/events/`);
-      const data = await res.json();
-      const found = (data || []).find((e) => String(e.id) === String(eventId));
-      setEvent(found || null);
+      const res = await fetch(`${API}/events/${eventId}`);
+      setEvent(res.ok ? await res.json() : null);
       
       setLastTicketId(null);
       setIsTicketPurchased(false);
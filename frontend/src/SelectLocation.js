@@ -21,42 +21,30 @@ styleSheet.innerText = `.emoji-icon { font-size: 32px; line-height: 32px; }`;
 document.head.appendChild(styleSheet);
 
 function SelectLocation() {
-  const [events, setEvents] = useState([]);
+  const [locations, setLocations] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [selectedLocation, setSelectedLocation] = useState(null);
 
-  const loadEvents = async () => {
+  const loadLocations = async () => {
     setLoading(true);
     try {
-      const response = await fetch("http://localhost:8000/events/");
+      const response = await fetch("http://localhost:8000/locations");
       if (!response.ok) throw new Error("HTTP error " + response.status);
-      const data = await response.json();
-
-      const uniqueEvents = Array.from(new Map(data.map(e => [e.id, e])).values());
-
-      setEvents(uniqueEvents);
+      setLocations(await response.json());
       setError("");
     } catch (err) {
       console.error(err);
-      setError("Failed to load events");
+      setError("Failed to load locations");
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    loadEvents();
+    loadLocations();
   }, []);
 
-  const markAsSeen = (id) => {
-    const seenMovies = JSON.parse(localStorage.getItem("seenMovies") || "[]");
-    if (!seenMovies.includes(id)) seenMovies.push(id);
-    localStorage.setItem("seenMovies", JSON.stringify(seenMovies));
-
-    setEvents((prev) => prev.filter((event) => event.id !== id));
-  };
-
   if (loading) return <div>Loading...</div>;
   if (error) return <div>{error}</div>;
 
@@ -67,25 +55,23 @@ function SelectLocation() {
       </h1>
 
       <div style={{ textAlign: "center", marginBottom: "30px" }}>
-        <select onChange={(e) => setSelectedLocation(e.target.value)} defaultValue=""
+        <select onChange={(e) => setSelectedLocation(e.target.value)} value={selectedLocation || ""}
                 style={{ padding: "10px 20px", borderRadius: "15px", border: "2px solid #ffb3d1", fontSize: "16px", outline: "none", cursor: "pointer" }}>
           <option value="" disabled>Select cinema on map</option>
-          {events.map((event) => (
-            <option key={event.id} value={event.location}>
-              {event.title} - {event.location}
+          {locations.map((item) => (
+            <option key={item.location} value={item.location}>
+              {item.location}
             </option>
           ))}
         </select>
       </div>
 
       <div style={{ display: "flex", flexWrap: "wrap", gap: "20px", justifyContent: "center" }}>
-        {events.map((event) => (
-          <div key={event.id} style={{ background: "#fff", padding: "20px", borderRadius: "15px", boxShadow: "0 4px 12px rgba(0,0,0,0.1)", width: "220px", cursor: "pointer" }}
-               onClick={() => markAsSeen(event.id)}>
-            <h3 style={{ color: "#d63384", marginBottom: "10px" }}>{event.title}</h3>
-            <p>📍 {event.location}</p>
-            <p>🎟️ {event.available_tickets}/{event.total_tickets}</p>
-            <p>💰 {event.price} lei</p>
+        {locations.map((item) => (
+          <div key={item.location} style={{ background: "#fff", padding: "20px", borderRadius: "15px", boxShadow: "0 4px 12px rgba(0,0,0,0.1)", width: "220px", cursor: "pointer" }}
+               onClick={() => setSelectedLocation(item.location)}>
+            <h3 style={{ color: "#d63384", marginBottom: "10px" }}>📍 {item.location}</h3>
+            <p>🎬 {item.upcoming_events} upcoming events</p>
           </div>
         ))}
       </div>